@@ -1,80 +1,368 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+import soupsieve
+from lxml import etree
+import re
 import smtplib
 import time
+import random
 import csv
 import os
 import json
 import logging
-from datetime import datetime
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 import concurrent.futures
 import argparse
 import matplotlib.pyplot as plt
+import numpy as np
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+
+# Each worker checks one host at a time, so the session keeps one connection pool per
+# worker to avoid evicting (and reconnecting to) hosts between cycles
+MAX_WORKERS = 20
+
+# Default pause (in seconds) between consecutive requests to the same host
+DEFAULT_MIN_DELAY = 1.0
+DEFAULT_MAX_DELAY = 2.5
+
+# Products falling due within this many seconds of each other are checked in the same batch
+SCHEDULE_COALESCE_WINDOW = 5
+
+# Histories longer than this are drawn as a raster image to keep chart rendering fast
+RASTERIZE_THRESHOLD = 5000
+
+# Price history arrays grow by at least this many points at a time
+HISTORY_CHUNK_SIZE = 1024
+
+# Only the most recent points are kept in memory; the CSV file holds the full history
+MAX_HISTORY_POINTS = 10_000
+
+# A price within this tolerance of the last recorded one counts as unchanged, and an
+# unchanged price is only written again once the last row is older than the max age
+PRICE_TOLERANCE = 1e-6
+UNCHANGED_PRICE_MAX_AGE = np.timedelta64(24, 'h')
+
+# Bytes read from the socket per step when streaming a page into the pull parser
+STREAM_CHUNK_SIZE = 16384
+
+# Local response cache used when requests-cache is installed, so the first check after a
+# restart can be answered from disk instead of the retailer. Later checks always refresh,
+# so the cache never serves a stale page in place of a product's own polling interval.
+# requests-cache reads every response body in full to store it, which means pages are no
+# longer abandoned early once the price element has been found.
+HTTP_CACHE_PATH = os.path.join("price_data", "http_cache")
+HTTP_CACHE_EXPIRY = timedelta(minutes=30)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36"
+
+
+def create_session():
+    """Create an HTTP session that keeps connections alive and retries transient errors"""
+    # requests already advertises br/zstd in Accept-Encoding (and decodes them) whenever
+    # the brotli/zstandard packages are installed, so the header is left at its default
+    if requests_cache is not None:
+        session = requests_cache.CachedSession(HTTP_CACHE_PATH, backend='sqlite', expire_after=HTTP_CACHE_EXPIRY)
+    else:
+        session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=MAX_WORKERS, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+# Matches selectors like "span.price", ".price", "span#price" or "span"
+_SIMPLE_SELECTOR_RE = re.compile(r'^([a-zA-Z][\w-]*)?(?:\.([\w-]+)|#([\w-]+))?$')
+
+
+def _parse_simple_selector(selector):
+    """Split a simple tag/class/id selector into (tag, attrs), or None if it is more complex"""
+    match = _SIMPLE_SELECTOR_RE.match(selector.strip())
+    if not match or not any(match.groups()):
+        return None
+    tag, css_class, element_id = match.groups()
+    attrs = {}
+    if css_class:
+        attrs['class'] = css_class
+    if element_id:
+        attrs['id'] = element_id
+    return tag, attrs
+
+
+def _read_json(path):
+    """Read a JSON file, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'rb') as file:
+            return orjson.loads(file.read())
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def _write_json(path, data):
+    """Write data as indented JSON, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'wb') as file:
+            file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        # orjson only supports two-space indents, so match it to keep files identical either way
+        with open(path, 'w') as file:
+            json.dump(data, file, indent=2)
+
+
+def _email_settings():
+    """Read (sender, receiver, password) for alert emails from environment variables"""
+    sender = os.getenv("EMAIL_SENDER")
+    receiver = os.getenv("EMAIL_RECEIVER") or sender
+    password = os.getenv("EMAIL_PASSWORD")
+    return sender, receiver, password
+
+
+# First number in the text. Thousands may be grouped with "," (including Indian lakh/crore
+# grouping such as 1,49,999), spaces, or "." (the latter only when there are several groups
+# or a "," decimal part follows, so "12.999" stays a decimal; a lone "1.299" is therefore read
+# as 1.299, not 1299), followed by an optional 1-3 digit decimal part after "." or ",".
+# A bare ".99" is also accepted, unless it follows a letter ("Rs.1,499") or more digits follow.
+_PRICE_RE = re.compile(
+    r'(?:'
+    r'([0-9]{1,3}(?:,[0-9]{3})+'
+    r'|[0-9]{1,2}(?:,[0-9]{2})+,[0-9]{3}'
+    r'|[0-9]{1,3}(?:\.[0-9]{3}){2,}'
+    r'|[0-9]{1,3}\.[0-9]{3}(?=,[0-9])'
+    r'|[0-9]{1,3}(?:[ \xa0\u202f][0-9]{3})+'
+    r'|[0-9]+)'
+    r'(?:[.,]([0-9]{1,3}))?'
+    r'|(?<![^\W\d_])[.,]([0-9]{1,3})(?![.,]?[0-9])'
+    r')(?![0-9])'
+)
+_STRIP_THOUSANDS = str.maketrans('', '', ',. \xa0\u202f')
+
 
 class PriceTracker:
-    def __init__(self, url, product_name, target_price, selector=None):
+    def __init__(self, url, product_name, target_price, selector=None, session=None, interval=None, jitter=0):
         self.url = url
         self.product_name = product_name
         self.target_price = target_price
-        self.price_history = []
+        # Seconds between checks (None uses the global --interval) and random extra delay on top
+        self.interval = interval
+        self.jitter = jitter
+        # Price history is kept as parallel arrays; only the first _history_len entries are valid
+        self._timestamps = np.empty(0, dtype='datetime64[s]')
+        self._prices = np.empty(0, dtype=np.float64)
+        self._history_len = 0
         self.selector = selector or 'span.price'
+        # A bad selector only disables this tracker; it stays in the config so it can be fixed
+        self.selector_error = None
+        try:
+            self._compiled_selector = soupsieve.compile(self.selector)
+        except soupsieve.SelectorSyntaxError as e:
+            self._compiled_selector = None
+            self.selector_error = str(e)
+            logging.error(f"Invalid selector {self.selector!r} for {self.product_name}: {e}")
+        # Simple selectors are matched while the page streams in; anything else needs a full parse
+        self._simple_selector = _parse_simple_selector(self.selector)
         self.data_dir = "price_data"
+        self._session = session or create_session()
+        # Only the first check after start-up may be served from the response cache
+        self._uses_response_cache = requests_cache is not None and isinstance(self._session, requests_cache.CachedSession)
+        self._first_check = True
         
-        # Create data directory if it doesn't exist
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
-            
         # Load price history if it exists
         self._load_price_history()
         
+        # HTTP validators from the last successful fetch, used for conditional GETs
+        self._etag = None
+        self._last_modified = None
+        self._load_validators()
+        
     def _load_price_history(self):
         csv_path = os.path.join(self.data_dir, f"{self.product_name}_price_history.csv")
         if os.path.exists(csv_path):
             try:
                 with open(csv_path, 'r', newline='') as file:
-                    reader = csv.DictReader(file)
-                    for row in reader:
-                        row['price'] = float(row['price'])
-                        self.price_history.append(row)
-                logging.info(f"Loaded {len(self.price_history)} historical price points for {self.product_name}")
+                    reader = csv.reader(file)
+                    next(reader, None)  # Skip header
+                    # Skip blank lines, which csv.reader returns as empty rows
+                    rows = deque((row for row in reader if row), maxlen=MAX_HISTORY_POINTS)
+                self._timestamps = np.array([row[0] for row in rows], dtype='datetime64[s]')
+                self._prices = np.array([row[1] for row in rows], dtype=np.float64)
+                self._history_len = len(self._prices)
+                logging.info(f"Loaded {self._history_len} historical price points for {self.product_name}")
             except Exception as e:
                 logging.error(f"Error loading price history: {e}")
 
-    def check_price(self):
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36"
-        }
+    def _validators_path(self):
+        return os.path.join(self.data_dir, f"{self.product_name}_http_cache.json")
+
+    def _load_validators(self):
+        validators_path = self._validators_path()
+        if os.path.exists(validators_path):
+            try:
+                validators = _read_json(validators_path)
+                self._etag = validators.get('etag')
+                self._last_modified = validators.get('last_modified')
+            except Exception as e:
+                logging.error(f"Error loading HTTP cache validators: {e}")
+
+    def _save_validators(self, etag, last_modified):
+        """Persist the ETag/Last-Modified of the page the latest price was read from"""
+        if (etag, last_modified) == (self._etag, self._last_modified):
+            return
+        self._etag = etag
+        self._last_modified = last_modified
+        _write_json(self._validators_path(), {"etag": etag, "last_modified": last_modified})
+
+    def _append_price_point(self, timestamp, price):
+        """Record a price, growing the history arrays a chunk at a time up to MAX_HISTORY_POINTS"""
+        if self._history_len == len(self._prices):
+            if self._history_len >= MAX_HISTORY_POINTS:
+                # Window is full: drop a chunk of the oldest points at once rather than one per append
+                keep = MAX_HISTORY_POINTS - HISTORY_CHUNK_SIZE
+                start = self._history_len - keep
+                self._timestamps[:keep] = self._timestamps[start:self._history_len]
+                self._prices[:keep] = self._prices[start:self._history_len]
+                self._history_len = keep
+            else:
+                grow_by = min(max(HISTORY_CHUNK_SIZE, self._history_len), MAX_HISTORY_POINTS - self._history_len)
+                self._timestamps = np.concatenate([self._timestamps, np.empty(grow_by, dtype='datetime64[s]')])
+                self._prices = np.concatenate([self._prices, np.empty(grow_by, dtype=np.float64)])
+        self._timestamps[self._history_len] = np.datetime64(timestamp, 's')
+        self._prices[self._history_len] = price
+        self._history_len += 1
+
+    def _is_repeat_of_last_price(self, price, timestamp):
+        """True if price matches the last recorded row and that row is recent enough to stand for this check"""
+        if not self._history_len:
+            return False
+        last_price = self._prices[self._history_len - 1]
+        last_timestamp = self._timestamps[self._history_len - 1]
+        return (abs(price - last_price) <= PRICE_TOLERANCE
+                and np.datetime64(timestamp, 's') - last_timestamp < UNCHANGED_PRICE_MAX_AGE)
+
+    def _record_price(self, price):
+        """Append price to the history unless it repeats a recent row"""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if self._is_repeat_of_last_price(price, timestamp):
+            return
+        self._append_price_point(timestamp, price)
+        self.save_to_csv((timestamp, price))
         
-        try:
-            page = requests.get(self.url, headers=headers, timeout=30)
-            page.raise_for_status()  # Raise exception for 4XX/5XX responses
+        # Check if this is a price drop
+        if self._history_len > 1 and self._prices[self._history_len - 1] < self._prices[self._history_len - 2]:
+            logging.info(f"Price drop detected for {self.product_name}: ${self._prices[self._history_len - 2]} -> ${price}")
+
+    def _history_rows(self):
+        """Yield (timestamp, price) pairs in the CSV's "YYYY-MM-DD HH:MM:SS" format"""
+        timestamps = np.datetime_as_string(self._timestamps[:self._history_len], unit='s')
+        for timestamp, price in zip(timestamps, self._prices[:self._history_len].tolist()):
+            yield timestamp.replace('T', ' '), price
+
+    def _matches_simple_selector(self, element):
+        tag, attrs = self._simple_selector
+        if not isinstance(element.tag, str):
+            return False
+        if tag and element.tag != tag.lower():
+            return False
+        if 'class' in attrs and attrs['class'] not in (element.get('class') or '').split():
+            return False
+        if 'id' in attrs and element.get('id') != attrs['id']:
+            return False
+        return True
+
+    def _stream_price_text(self, page):
+        """Feed the page to lxml as it downloads and stop reading once the price element is complete"""
+        # Use the charset from Content-Type when there is one; requests' ISO-8859-1 default
+        # for text/* without a charset is not passed on, so lxml can still honour <meta charset>
+        has_charset = 'charset=' in page.headers.get('Content-Type', '').lower()
+        parser = etree.HTMLPullParser(events=('end',), encoding=page.encoding if has_charset else None)
+        for chunk in page.iter_content(STREAM_CHUNK_SIZE):
+            parser.feed(chunk)
+            price_text = self._find_price_text(parser)
+            if price_text is not None:
+                return price_text
+        # Elements left open until the end of the document are only closed here
+        parser.close()
+        return self._find_price_text(parser)
+
+    def _find_price_text(self, parser):
+        for _, element in parser.read_events():
+            if self._matches_simple_selector(element):
+                return ''.join(element.itertext())
+        return None
+
+    def check_price(self, send_alert=True):
+        """Fetch the current price; with send_alert=False the caller is responsible for alerts"""
+        if self.selector_error:
+            logging.warning(f"Skipping {self.product_name}: invalid selector {self.selector!r}")
+            return None
             
-            soup = BeautifulSoup(page.content, 'html.parser')
+        request_options = {}
+        if self._uses_response_cache and not self._first_check:
+            request_options['force_refresh'] = True
+        self._first_check = False
+        
+        # Let the server answer 304 Not Modified when the page hasn't changed since the last recorded price
+        headers = {}
+        if self._history_len:
+            if self._etag:
+                headers['If-None-Match'] = self._etag
+            if self._last_modified:
+                headers['If-Modified-Since'] = self._last_modified
+                
+        try:
+            # Stream the body straight into the parser instead of buffering page.content first;
+            # leaving the block early closes the response without downloading the rest
+            with self._session.get(self.url, headers=headers, timeout=30, stream=True, **request_options) as page:
+                if page.status_code == 304:
+                    price = float(self._prices[self._history_len - 1])
+                    # Still writes the daily heartbeat row if the last one is old enough
+                    self._record_price(price)
+                    logging.info(f"{self.product_name} not modified since last check, price still ${price}")
+                    if send_alert and price <= self.target_price:
+                        self.send_email(price)
+                    return price
+                    
+                page.raise_for_status()  # Raise exception for 4XX/5XX responses
+                etag = page.headers.get('ETag')
+                last_modified = page.headers.get('Last-Modified')
+                
+                # This selector would need to be adjusted based on the actual website
+                if self._simple_selector:
+                    price_text = self._stream_price_text(page)
+                else:
+                    page.raw.decode_content = True
+                    soup = BeautifulSoup(page.raw, 'lxml')
+                    price_element = self._compiled_selector.select_one(soup)
+                    price_text = price_element.get_text() if price_element else None
             
-            # This selector would need to be adjusted based on the actual website
-            price_element = soup.select_one(self.selector)
-            if price_element:
-                price_text = price_element.get_text().strip()
+            if price_text is not None:
+                price_text = price_text.strip()
                 # More robust price extraction
                 price = self._extract_price(price_text)
                 
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                current_data = {"timestamp": timestamp, "price": price}
-                self.price_history.append(current_data)
-                
-                self.save_to_csv()
+                self._record_price(price)
+                self._save_validators(etag, last_modified)
                 
                 # Only send email if price has dropped below target
-                if price <= self.target_price:
+                if send_alert and price <= self.target_price:
                     self.send_email(price)
-                    
-                # Check if this is a price drop
-                if len(self.price_history) > 1 and price < self.price_history[-2]['price']:
-                    logging.info(f"Price drop detected for {self.product_name}: ${self.price_history[-2]['price']} -> ${price}")
                 
                 return price
             else:
@@ -87,56 +375,67 @@ class PriceTracker:
         return None
     
     def _extract_price(self, price_text):
-        """More robust price extraction that handles different formats"""
-        # Remove currency symbols, commas, and spaces
-        clean_text = ''.join(c for c in price_text if c.isdigit() or c == '.')
-        # Find the last occurrence of a valid decimal number pattern
-        parts = clean_text.split('.')
-        if len(parts) > 1:
-            # Take the last decimal point as the actual one
-            whole = ''.join(parts[:-1])
-            decimal = parts[-1]
-            return float(f"{whole}.{decimal}")
-        return float(clean_text)
+        """More robust price extraction that handles different formats, e.g. $1,234.56, 1.234,56 € or ₹1,49,999"""
+        match = _PRICE_RE.search(price_text)
+        if not match:
+            raise ValueError(f"No price found in {price_text!r}")
+        whole = (match.group(1) or '0').translate(_STRIP_THOUSANDS)
+        decimal = match.group(2) or match.group(3) or '0'
+        return float(f"{whole}.{decimal}")
         
-    def save_to_csv(self):
+    def save_to_csv(self, new_row=None):
+        """Append a (timestamp, price) row to the history file, or rewrite the whole file when no row is given"""
         csv_path = os.path.join(self.data_dir, f"{self.product_name}_price_history.csv")
-        with open(csv_path, 'w', newline='') as file:
-            writer = csv.DictWriter(file, fieldnames=["timestamp", "price"])
-            writer.writeheader()
-            writer.writerows(self.price_history)
+        if new_row is None:
+            # Full rewrite, only needed when importing or migrating history. Note this
+            # writes the in-memory window, so older rows beyond MAX_HISTORY_POINTS are dropped
+            with open(csv_path, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(("timestamp", "price"))
+                writer.writerows(self._history_rows())
+            return
+            
+        write_header = not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0
+        with open(csv_path, 'a', newline='') as file:
+            writer = csv.writer(file)
+            if write_header:
+                writer.writerow(("timestamp", "price"))
+            writer.writerow(new_row)
     
+    def build_alert_message(self, current_price, sender, receiver):
+        """Build the price alert email for this product"""
+        msg = MIMEMultipart()
+        msg['From'] = sender
+        msg['To'] = receiver
+        msg['Subject'] = f"Price Alert: {self.product_name}"
+        
+        # Create a nicer HTML email
+        email_content = f"""
+        <html>
+        <body>
+            <h2>Price Alert for {self.product_name}</h2>
+            <p>Good news! The price has dropped to <strong>${current_price:.2f}</strong></p>
+            <p>This is below your target price of <strong>${self.target_price:.2f}</strong></p>
+            <p><a href="{self.url}">Click here to view the product</a></p>
+            <hr>
+            <p><small>This alert was sent from your Price Tracker application.</small></p>
+        </body>
+        </html>
+        """
+        
+        msg.attach(MIMEText(email_content, 'html'))
+        return msg
+        
     def send_email(self, current_price):
         # Get email configuration from environment variables
-        sender = os.getenv("EMAIL_SENDER")
-        receiver = os.getenv("EMAIL_RECEIVER") or sender
-        password = os.getenv("EMAIL_PASSWORD")
+        sender, receiver, password = _email_settings()
         
         if not all([sender, receiver, password]):
             logging.error("Email configuration incomplete. Check your .env file.")
             return False
             
         try:
-            msg = MIMEMultipart()
-            msg['From'] = sender
-            msg['To'] = receiver
-            msg['Subject'] = f"Price Alert: {self.product_name}"
-            
-            # Create a nicer HTML email
-            email_content = f"""
-            <html>
-            <body>
-                <h2>Price Alert for {self.product_name}</h2>
-                <p>Good news! The price has dropped to <strong>${current_price:.2f}</strong></p>
-                <p>This is below your target price of <strong>${self.target_price:.2f}</strong></p>
-                <p><a href="{self.url}">Click here to view the product</a></p>
-                <hr>
-                <p><small>This alert was sent from your Price Tracker application.</small></p>
-            </body>
-            </html>
-            """
-            
-            msg.attach(MIMEText(email_content, 'html'))
+            msg = self.build_alert_message(current_price, sender, receiver)
             
             with smtplib.SMTP('smtp.gmail.com', 587) as server:
                 server.starttls()
@@ -151,15 +450,15 @@ class PriceTracker:
             
     def generate_price_chart(self):
         """Generate a price history chart"""
-        if len(self.price_history) < 2:
+        if self._history_len < 2:
             logging.warning(f"Not enough price data to generate chart for {self.product_name}")
             return None
             
-        dates = [datetime.strptime(item['timestamp'], "%Y-%m-%d %H:%M:%S") for item in self.price_history]
-        prices = [item['price'] for item in self.price_history]
+        dates = self._timestamps[:self._history_len]
+        prices = self._prices[:self._history_len]
         
         plt.figure(figsize=(10, 6))
-        plt.plot(dates, prices, marker='o', linestyle='-')
+        plt.plot(dates, prices, marker='o', linestyle='-', rasterized=self._history_len > RASTERIZE_THRESHOLD)
         plt.title(f"Price History for {self.product_name}")
         plt.xlabel("Date")
         plt.ylabel("Price ($)")
@@ -179,17 +478,23 @@ class PriceTrackerManager:
     def __init__(self, config_path="config.json"):
         self.config_path = config_path
         self.trackers = []
+        # Per-host request pacing, e.g. {"www.example.com": {"min_delay": 2, "max_delay": 5}}
+        self.host_settings = {}
+        # Create the data directory once here rather than in every PriceTracker
+        os.makedirs("price_data", exist_ok=True)
+        # Shared across trackers so connections to the same host are reused
+        self.session = create_session()
         self.load_config()
         
     def load_config(self):
         """Load product configuration from JSON file"""
         if os.path.exists(self.config_path):
             try:
-                with open(self.config_path, 'r') as file:
-                    config = json.load(file)
+                config = _read_json(self.config_path)
                     
                 # Reset trackers
                 self.trackers = []
+                self.host_settings = config.get('hosts', {})
                 
                 # Create tracker for each product
                 for product in config.get('products', []):
@@ -197,7 +502,10 @@ class PriceTrackerManager:
                         url=product['url'],
                         product_name=product['name'],
                         target_price=product['target_price'],
-                        selector=product.get('selector', 'span.price')
+                        selector=product.get('selector', 'span.price'),
+                        session=self.session,
+                        interval=product.get('interval'),
+                        jitter=product.get('jitter', 0)
                     )
                     self.trackers.append(tracker)
                     
@@ -209,26 +517,33 @@ class PriceTrackerManager:
             
     def save_config(self):
         """Save current configuration to JSON file"""
-        config = {
-            "products": [
-                {
-                    "url": tracker.url,
-                    "name": tracker.product_name,
-                    "target_price": tracker.target_price,
-                    "selector": tracker.selector
-                }
-                for tracker in self.trackers
-            ]
-        }
+        products = []
+        for tracker in self.trackers:
+            product = {
+                "url": tracker.url,
+                "name": tracker.product_name,
+                "target_price": tracker.target_price,
+                "selector": tracker.selector
+            }
+            if tracker.interval is not None:
+                product["interval"] = tracker.interval
+            if tracker.jitter:
+                product["jitter"] = tracker.jitter
+            products.append(product)
+            
+        config = {"products": products}
+        if self.host_settings:
+            config["hosts"] = self.host_settings
         
-        with open(self.config_path, 'w') as file:
-            json.dump(config, file, indent=4)
+        _write_json(self.config_path, config)
         
         logging.info(f"Configuration saved with {len(self.trackers)} products")
             
     def add_product(self, url, name, target_price, selector=None):
         """Add a new product to track"""
-        tracker = PriceTracker(url, name, target_price, selector)
+        tracker = PriceTracker(url, name, target_price, selector, session=self.session)
+        if tracker.selector_error:
+            raise ValueError(f"Invalid selector {tracker.selector!r}: {tracker.selector_error}")
         self.trackers.append(tracker)
         self.save_config()
         return tracker
@@ -237,36 +552,166 @@ class PriceTrackerManager:
         """Remove a product from tracking"""
         self.trackers = [t for t in self.trackers if t.product_name != product_name]
         self.save_config()
+
+    def _group_by_host(self, trackers):
+        """Bucket trackers by host so requests to the same site can be spaced out"""
+        host_groups = defaultdict(list)
+        for tracker in trackers:
+            host_groups[urlparse(tracker.url).netloc].append(tracker)
+        return host_groups
+
+    def _host_delay(self, host):
+        """Random pause before the next request to host, within its configured bounds"""
+        settings = self.host_settings.get(host, {})
+        min_delay = settings.get('min_delay', DEFAULT_MIN_DELAY)
+        max_delay = settings.get('max_delay', DEFAULT_MAX_DELAY)
+        return random.uniform(min_delay, max_delay)
+
+    def _check_host(self, host, trackers):
+        """Check one host's trackers sequentially, pausing between requests to avoid throttling"""
+        results = {}
+        for i, tracker in enumerate(trackers):
+            if i > 0:
+                time.sleep(self._host_delay(host))
+            results[tracker.product_name] = tracker.check_price(send_alert=False)
+        return results
+
+    def _check_host_and_alert(self, host, trackers):
+        """Check one host's trackers and send their alerts as a single batch"""
+        results = self._check_host(host, trackers)
+        self.send_alerts(self._collect_alerts(trackers, results))
+        return results
+
+    def _collect_alerts(self, trackers, results):
+        """Pick the (tracker, price) pairs whose price is at or below the target"""
+        alerts = []
+        for tracker in trackers:
+            price = results.get(tracker.product_name)
+            if price is not None and price <= tracker.target_price:
+                alerts.append((tracker, price))
+        return alerts
         
-    def check_all_prices(self, parallel=True):
-        """Check prices for all products, optionally in parallel"""
+    def check_all_prices(self, parallel=True, max_workers=MAX_WORKERS, trackers=None):
+        """Check prices for all products (or only the given trackers), optionally in parallel across hosts"""
         results = {}
+        # Grouped per call so whatever is in self.trackers right now gets checked
+        host_groups = self._group_by_host(self.trackers if trackers is None else trackers)
         
-        if parallel and len(self.trackers) > 1:
-            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                future_to_tracker = {executor.submit(tracker.check_price): tracker for tracker in self.trackers}
+        if parallel and len(host_groups) > 1:
+            # One worker per host: different sites are checked concurrently,
+            # products on the same site one after another
+            workers = min(max_workers, len(host_groups))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                future_to_host = {executor.submit(self._check_host, host, group): host for host, group in host_groups.items()}
                 
-                for future in concurrent.futures.as_completed(future_to_tracker):
-                    tracker = future_to_tracker[future]
+                for future in concurrent.futures.as_completed(future_to_host):
+                    host = future_to_host[future]
                     try:
-                        price = future.result()
-                        results[tracker.product_name] = price
+                        results.update(future.result())
                     except Exception as e:
-                        logging.error(f"Error checking price for {tracker.product_name}: {e}")
-                        results[tracker.product_name] = None
+                        logging.error(f"Error checking prices for {host}: {e}")
+                        for tracker in host_groups[host]:
+                            results.setdefault(tracker.product_name, None)
         else:
-            for tracker in self.trackers:
-                price = tracker.check_price()
-                results[tracker.product_name] = price
+            for host, group in host_groups.items():
+                results.update(self._check_host(host, group))
+                
+        # Collect alerts so they all go out over one SMTP connection
+        checked = [t for group in host_groups.values() for t in group]
+        self.send_alerts(self._collect_alerts(checked, results))
                 
         return results
+        
+    def run_forever(self, default_interval, max_workers=MAX_WORKERS):
+        """Poll each product on its own interval, checking every host independently so a slow
+        site never holds up products on other sites"""
+        next_due = {}
+        # Host -> future of its running check; at most one per host keeps the per-host pacing
+        in_flight = {}
+        # Host -> earliest time its next check may start after the previous one finished
+        host_ready_at = {}
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            while True:
+                # Collect hosts whose checks have finished
+                for host, future in list(in_flight.items()):
+                    if not future.done():
+                        continue
+                    del in_flight[host]
+                    host_ready_at[host] = time.monotonic() + self._host_delay(host)
+                    try:
+                        results = future.result()
+                        success_count = sum(1 for price in results.values() if price is not None)
+                        logging.info(f"Checked {len(results)} products on {host}, {success_count} successful")
+                    except Exception as e:
+                        logging.error(f"Error checking prices for {host}: {e}")
+                        
+                now = time.monotonic()
+                host_groups = self._group_by_host(self.trackers)
+                
+                # Start a check on every idle host with products due. Products are rescheduled
+                # when their check is submitted, so a slow check never pushes later runs back
+                for host, group in host_groups.items():
+                    if host in in_flight or host_ready_at.get(host, now) > now:
+                        continue
+                    due = [
+                        t for t in group
+                        if next_due.get(t.product_name, now) <= now + SCHEDULE_COALESCE_WINDOW
+                    ]
+                    if not due:
+                        continue
+                    in_flight[host] = executor.submit(self._check_host_and_alert, host, due)
+                    for tracker in due:
+                        interval = tracker.interval or default_interval
+                        next_due[tracker.product_name] = now + interval + random.uniform(0, tracker.jitter)
+                        
+                # Sleep until an idle host has a product due, or until a running check finishes
+                wake_at = now + default_interval
+                for host, group in host_groups.items():
+                    if host in in_flight:
+                        continue
+                    earliest_due = min(next_due.get(t.product_name, now) for t in group)
+                    wake_at = min(wake_at, max(earliest_due, host_ready_at.get(host, now)))
+                timeout = max(0, wake_at - time.monotonic())
+                if in_flight:
+                    concurrent.futures.wait(
+                        list(in_flight.values()), timeout=timeout,
+                        return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                else:
+                    time.sleep(timeout)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            
+    def send_alerts(self, alerts):
+        """Send a batch of (tracker, price) alerts over a single SMTP session"""
+        if not alerts:
+            return 0
+            
+        sender, receiver, password = _email_settings()
+        if not all([sender, receiver, password]):
+            logging.error("Email configuration incomplete. Check your .env file.")
+            return 0
+            
+        sent = 0
+        try:
+            with smtplib.SMTP('smtp.gmail.com', 587) as server:
+                server.starttls()
+                server.login(sender, password)
+                for tracker, price in alerts:
+                    server.send_message(tracker.build_alert_message(price, sender, receiver))
+                    logging.info(f"Email alert sent for {tracker.product_name}!")
+                    sent += 1
+        except Exception as e:
+            logging.error(f"Failed to send email alerts: {e}")
+            
+        return sent
 
 
 def setup_logging():
     """Configure logging"""
     log_dir = "logs"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+    os.makedirs(log_dir, exist_ok=True)
         
     log_file = os.path.join(log_dir, f"price_tracker_{datetime.now().strftime('%Y%m%d')}.log")
     
@@ -284,7 +729,7 @@ def parse_arguments():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description="Price Tracker Application")
     parser.add_argument("--config", default="config.json", help="Path to configuration file")
-    parser.add_argument("--interval", type=int, default=43200, help="Check interval in seconds (default: 12 hours)")
+    parser.add_argument("--interval", type=int, default=43200, help="Default check interval in seconds for products without their own (default: 12 hours)")
     parser.add_argument("--once", action="store_true", help="Check prices once and exit")
     parser.add_argument("--chart", action="store_true", help="Generate price history charts")
     
@@ -319,7 +764,11 @@ def main():
     
     # Handle commands
     if args.command == "add":
-        tracker = manager.add_product(args.url, args.name, args.target, args.selector)
+        try:
+            tracker = manager.add_product(args.url, args.name, args.target, args.selector)
+        except ValueError as e:
+            logging.error(f"Could not add {args.name}: {e}")
+            return
         price = tracker.check_price()
         if price:
             logging.info(f"Added {args.name} with current price: ${price}")
@@ -348,17 +797,10 @@ def main():
                 logging.warning(f"Could not fetch price for {name}")
     else:
         logging.info(f"Starting price monitoring with {len(manager.trackers)} products")
-        logging.info(f"Check interval: {args.interval} seconds")
+        logging.info(f"Default check interval: {args.interval} seconds")
         
         try:
-            while True:
-                results = manager.check_all_prices()
-                
-                success_count = sum(1 for price in results.values() if price is not None)
-                logging.info(f"Checked {len(results)} products, {success_count} successful")
-                
-                # Sleep until next check
-                time.sleep(args.interval)
+            manager.run_forever(args.interval)
         except KeyboardInterrupt:
             logging.info("Price monitoring stopped by user")
 
@@ -0,0 +1,35 @@
+import pytest
+
+price_tracker = pytest.importorskip("price_tracker")
+
+
+@pytest.mark.parametrize("price_text, expected", [
+    ("$19.99", 19.99),
+    ("$1,299.00", 1299.0),
+    ("1,234,567", 1234567.0),
+    ("1234.56", 1234.56),
+    ("1.234,56 €", 1234.56),
+    ("1.234.567,89", 1234567.89),
+    ("12,99 €", 12.99),
+    ("1\xa0299,99 €", 1299.99),
+    ("1 299,99 €", 1299.99),
+    ("£5", 5.0),
+    (".99", 0.99),
+    ("$12.999", 12.999),
+    ("Now $1,099.99 was $1,299.99", 1099.99),
+    ("₹1,49,999", 149999.0),
+    ("Rs. 2,49,900.00", 249900.0),
+    ("₹ 1,09,990.00", 109990.0),
+    ("₹12,34,56,789", 123456789.0),
+    ("Rs.1,499", 1499.0),
+    ("Rs.99", 99.0),
+])
+def test_extract_price(price_text, expected):
+    tracker = price_tracker.PriceTracker.__new__(price_tracker.PriceTracker)
+    assert tracker._extract_price(price_text) == pytest.approx(expected)
+
+
+def test_extract_price_without_number():
+    tracker = price_tracker.PriceTracker.__new__(price_tracker.PriceTracker)
+    with pytest.raises(ValueError):
+        tracker._extract_price("Out of stock")